@@ -1,19 +1,200 @@
 import re
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-import plotly.graph_objects as go
-import plotly.express as px
+
+# Month names and abbreviations recognised in queries
+_MONTHS: Dict[str, str] = {
+    'january': '01', 'jan': '01',
+    'february': '02', 'feb': '02',
+    'march': '03', 'mar': '03',
+    'april': '04', 'apr': '04',
+    'may': '05',
+    'june': '06', 'jun': '06',
+    'july': '07', 'jul': '07',
+    'august': '08', 'aug': '08',
+    'september': '09', 'sep': '09',
+    'october': '10', 'oct': '10',
+    'november': '11', 'nov': '11',
+    'december': '12', 'dec': '12'
+}
+
+# Display names indexed by month number (1-12)
+_MONTH_ABBR = ('', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+_MONTH_FULL = ('', 'January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December')
+
+def _fmt_month_short(ym: str) -> str:
+    """Format a YYYY-MM month as 'Jun 2025'"""
+    return f"{_MONTH_ABBR[int(ym[5:7])]} {ym[:4]}"
+
+def _fmt_month_full(ym: str) -> str:
+    """Format a YYYY-MM month as 'June 2025'"""
+    return f"{_MONTH_FULL[int(ym[5:7])]} {ym[:4]}"
+
+# Time-parameter patterns, compiled once at import.
+# Month aliases are longest-first so 'february' wins over 'feb'.
+_MONTH_RE = re.compile(
+    r'\b(' + '|'.join(sorted(_MONTHS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+_YEAR_RE = re.compile(r'202[3-6]')
+
+# Relative periods in priority order; the group name is the period value
+# (quarters become 'q1'..'q4'). Groups are anchored with a lazy prefix so
+# earlier periods win regardless of where they appear in the query.
+_PERIOD_PATTERNS = {
+    'last_3_months': r'last.*3.*months?',
+    'last_6_months': r'last.*6.*months?',
+    'last_month': r'last.*month',
+    'current_month': r'this.*month',
+    'ytd': r'ytd|year.*to.*date',
+    'quarter': r'q(?P<quarter_num>[1-4])'
+}
+_PERIOD_RE = re.compile("|".join(
+    f"(?P<{period}>(?s:.*?)(?:{pattern}))" for period, pattern in _PERIOD_PATTERNS.items()
+))
+
+# Trailing window length (in months) for each relative period; trends
+# without one default to the last 6 months
+_PERIOD_MONTHS = {'last_3_months': 3, 'last_6_months': 6}
+_DEFAULT_TREND_MONTHS = 6
+
+# Variance label indexed by (variance > 0)
+_BUDGET_STATUS = ("🔴 (Below budget)", "🟢 (Above budget)")
+
+# Runway status buckets: bisecting the month thresholds indexes the label
+_RUNWAY_THRESHOLDS = (6, 12)
+_RUNWAY_STATUS = (
+    "🔴 Critical - Consider fundraising",
+    "🟡 Caution - Monitor closely",
+    "🟢 Healthy"
+)
+
+# Errors a handler can hit on missing or malformed data; anything else is a bug
+_DATA_ERRORS = (KeyError, ValueError, IndexError)
+
+# Static help text returned for queries that match no intent
+_GENERAL_HELP = (
+    "I can help you with various financial analyses. Here are some things you can ask:\n\n"
+    "📊 **Revenue Analysis:**\n"
+    "• 'What was June 2025 revenue vs budget?'\n"
+    "• 'Show revenue trend for last 3 months'\n\n"
+    "💰 **Profitability:**\n"
+    "• 'What's our gross margin for June?'\n"
+    "• 'Show EBITDA for this month'\n\n"
+    "💸 **Expenses:**\n"
+    "• 'Break down OpEx by category'\n"
+    "• 'How much did we spend on R&D?'\n\n"
+    "🏦 **Cash Management:**\n"
+    "• 'What is our cash runway?'\n"
+    "• 'Show cash trend over 6 months'\n\n"
+    "Try asking one of these questions!"
+)
+
+def _growth_pct(values: np.ndarray) -> float:
+    """
+    Percentage growth of a monthly series held in a float64 array
+    
+    Args:
+        values: Series values in month order (at least one element)
+        
+    Returns:
+        Growth % from the first to the last value (0.0 when the first value is not positive)
+    """
+    first, last = values[0], values[-1]
+    return float((last - first) / first * 100) if first > 0 else 0.0
+
+@lru_cache(maxsize=512)
+def _classify(query_lower: str, intent_re: re.Pattern) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """
+    Classify a lowercased query and extract its explicit time parameters
+    
+    Results are memoized on (query, intent regex), so repeat queries from any
+    planner sharing the same intent patterns skip the regex work entirely.
+    
+    Args:
+        query_lower: Lowercased user query
+        intent_re: Combined intent regex from CFOPlanner._compile_intent_regex
+        
+    Returns:
+        Tuple of (intent, time parameters as (key, value) pairs)
+    """
+    params = []
+    
+    # Extract specific months (single scan, whole words only)
+    month_match = _MONTH_RE.search(query_lower)
+    if month_match:
+        month_num = _MONTHS[month_match.group(1).lower()]
+        # Assume 2025 if no year specified
+        year_match = _YEAR_RE.search(query_lower)
+        year = year_match.group() if year_match else '2025'
+        params.append(('specific_month', f"{year}-{month_num}"))
+    
+    # Extract relative time periods
+    period_match = _PERIOD_RE.match(query_lower)
+    if period_match:
+        period = period_match.lastgroup
+        if period == 'quarter':
+            period = f"q{period_match.group('quarter_num')}"
+        params.append(('period', period))
+    
+    # Single pass over the query; the matching group names the intent
+    match = intent_re.match(query_lower)
+    intent = match.lastgroup if match else 'general'
+    return intent, tuple(params)
+
+@dataclass
+class QueryResult:
+    """
+    Structured answer to a query
+    
+    Attributes:
+        text: Formatted markdown response
+        chart_df: Data to plot alongside the text, if any
+        chart_kind: Plotly chart type for chart_df
+        is_error: True when the handler hit a data error; such results are not cached
+    """
+    text: str
+    chart_df: Optional[pd.DataFrame] = None
+    chart_kind: str = 'line'
+    is_error: bool = False
 
 class CFOPlanner:
     """
     Main planning agent that interprets CFO queries and routes to appropriate tools
     """
     
+    __slots__ = (
+        'tools', '_data_version', '_latest_month', '_short_names', '_long_names',
+        'intent_patterns', '_combined_intent_re', '_dispatch', '_result_cache'
+    )
+    
+    _RESULT_CACHE_SIZE = 128
+    
     def __init__(self, financial_tools):
         self.tools = financial_tools
+        # Month tables are built per data version; see _sync_month_tables
+        self._data_version = None
+        self._sync_month_tables()
         self.intent_patterns = self._build_intent_patterns()
+        self._combined_intent_re = self._compile_intent_regex(self.intent_patterns)
+        self._dispatch = {
+            'revenue_vs_budget': self._handle_revenue_vs_budget,
+            'revenue_trend': self._handle_revenue_trend,
+            'gross_margin': self._handle_gross_margin,
+            'opex_breakdown': self._handle_opex_breakdown,
+            'cash_runway': self._handle_cash_runway,
+            'cash_trend': self._handle_cash_trend,
+            'ebitda': self._handle_ebitda
+        }
+        # LRU cache of QueryResults keyed on (intent, params, data_version)
+        self._result_cache = OrderedDict()
     
     def _build_intent_patterns(self) -> Dict[str, List[str]]:
         """Build regex patterns for intent classification"""
@@ -64,11 +245,65 @@ class CFOPlanner:
             ]
         }
     
+    def _compile_intent_regex(self, intent_patterns: Dict[str, List[str]]) -> re.Pattern:
+        """
+        Compile all intent patterns into one regex with a named group per intent
+        
+        Each group is anchored at the start of the query and consumes a lazy
+        prefix, so the alternation is tried in intent order rather than by
+        leftmost match position. This keeps the dict order as intent priority.
+        """
+        groups = "|".join(
+            f"(?P<{intent}>(?s:.*?)(?:{'|'.join(patterns)}))"
+            for intent, patterns in intent_patterns.items()
+        )
+        return re.compile(groups, re.IGNORECASE)
+    
+    def _sync_month_tables(self):
+        """Rebuild the latest month and month display names if the tools' data changed"""
+        if self._data_version == self.tools.data_version:
+            return
+        month_columns = self.tools.month_columns
+        self._latest_month = month_columns[-1] if month_columns else '2025-12'
+        # Display names for known months, built once per data load ('Jun 2025' / 'June 2025')
+        self._short_names = {m: _fmt_month_short(m) for m in month_columns}
+        self._long_names = {m: _fmt_month_full(m) for m in month_columns}
+        self._data_version = self.tools.data_version
+    
     def _get_latest_month(self) -> str:
-        """Get the latest month from available data"""
-        if self.tools.month_columns:
-            return max(self.tools.month_columns)
-        return '2025-12'  # Fallback
+        """Get the latest month from available data (falls back to 2025-12)"""
+        self._sync_month_tables()
+        return self._latest_month
+    
+    def _month_name(self, month: str, long: bool = False) -> str:
+        """
+        Format a YYYY-MM month for display, memoizing months not seen at load
+        
+        Args:
+            month: Month in YYYY-MM format
+            long: Use the full month name ('June 2025') instead of 'Jun 2025'
+            
+        Returns:
+            Display name for the month
+        """
+        names = self._long_names if long else self._short_names
+        name = names.get(month)
+        if name is None:
+            name = names[month] = _fmt_month_full(month) if long else _fmt_month_short(month)
+        return name
+    
+    def _month_labels(self, months: pd.Series) -> np.ndarray:
+        """
+        Short display names ('Jun 2025') for a whole column of YYYY-MM months
+        
+        Known months come from the cached names in one map; any others are
+        formatted from the month-name tables.
+        """
+        labels = months.map(self._short_names)
+        missing = labels.isna()
+        if missing.any():
+            labels[missing] = months[missing].map(_fmt_month_short)
+        return labels.to_numpy()
     
     def _calculate_month_range(self, months_back: int, end_month: str = None) -> Tuple[str, str]:
         """
@@ -84,9 +319,9 @@ class CFOPlanner:
         if end_month is None:
             end_month = self._get_latest_month()
         
-        end_dt = datetime.strptime(end_month, '%Y-%m')
-        start_dt = end_dt - relativedelta(months=months_back - 1)
-        start_month = start_dt.strftime('%Y-%m')
+        # Count months from year 0 so the window can cross year boundaries
+        month_index = int(end_month[:4]) * 12 + int(end_month[5:7]) - months_back
+        start_month = f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
         
         return start_month, end_month
     
@@ -100,73 +335,19 @@ class CFOPlanner:
         Returns:
             Tuple of (intent, parameters)
         """
-        query_lower = query.lower()
-        
-        # Extract month/time parameters
-        params = self._extract_time_params(query_lower)
-        
-        # Check each intent pattern
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower):
-                    return intent, params
-        
-        return 'general', params
-    
-    def _extract_time_params(self, query: str) -> Dict:
-        """Extract time-related parameters from query"""
-        params = {}
-        
-        # Extract specific months
-        months = {
-            'january': '01', 'jan': '01',
-            'february': '02', 'feb': '02', 
-            'march': '03', 'mar': '03',
-            'april': '04', 'apr': '04',
-            'may': '05',
-            'june': '06', 'jun': '06',
-            'july': '07', 'jul': '07',
-            'august': '08', 'aug': '08',
-            'september': '09', 'sep': '09',
-            'october': '10', 'oct': '10',
-            'november': '11', 'nov': '11',
-            'december': '12', 'dec': '12'
-        }
-        
-        for month_name, month_num in months.items():
-            if month_name in query:
-                # Assume 2025 if no year specified
-                year = '2025'
-                if re.search(r'202[3-6]', query):
-                    year = re.search(r'202[3-6]', query).group()
-                params['specific_month'] = f"{year}-{month_num}"
-                break
-        
-        # Extract relative time periods
-        if re.search(r'last.*3.*months?', query):
-            params['period'] = 'last_3_months'
-        elif re.search(r'last.*6.*months?', query):
-            params['period'] = 'last_6_months'
-        elif re.search(r'last.*month', query):
-            params['period'] = 'last_month'
-        elif re.search(r'this.*month', query):
-            params['period'] = 'current_month'
-        elif re.search(r'ytd|year.*to.*date', query):
-            params['period'] = 'ytd'
-        elif re.search(r'q[1-4]|quarter', query):
-            quarter_match = re.search(r'q([1-4])', query)
-            if quarter_match:
-                params['period'] = f'q{quarter_match.group(1)}'
+        # Normalize so case and surrounding whitespace share one cache entry
+        intent, time_params = _classify(query.lower().strip(), self._combined_intent_re)
+        params = dict(time_params)
         
         # Default to latest available month if no time specified
         if 'specific_month' not in params and 'period' not in params:
             params['specific_month'] = self._get_latest_month()
         
-        return params
+        return intent, params
     
     def process_query(self, query: str) -> str:
         """
-        Process a user query and return formatted response with chart data
+        Process a user query and return formatted response
         
         Args:
             query: User's natural language query
@@ -174,31 +355,48 @@ class CFOPlanner:
         Returns:
             Formatted response string
         """
-        try:
-            intent, params = self.classify_intent(query)
-            
-            # Route to appropriate handler
-            if intent == 'revenue_vs_budget':
-                return self._handle_revenue_vs_budget(params)
-            elif intent == 'revenue_trend':
-                return self._handle_revenue_trend(params)
-            elif intent == 'gross_margin':
-                return self._handle_gross_margin(params)
-            elif intent == 'opex_breakdown':
-                return self._handle_opex_breakdown(params)
-            elif intent == 'cash_runway':
-                return self._handle_cash_runway(params)
-            elif intent == 'cash_trend':
-                return self._handle_cash_trend(params)
-            elif intent == 'ebitda':
-                return self._handle_ebitda(params)
-            else:
-                return self._handle_general_query(query)
-                
-        except Exception as e:
-            return f"I apologize, but I encountered an error processing your query: {str(e)}. Please try rephrasing your question."
+        return self.run_query(query).text
     
-    def _handle_revenue_vs_budget(self, params: Dict) -> str:
+    def run_query(self, query: str) -> QueryResult:
+        """
+        Process a user query and return the response text with any chart data
+        
+        Args:
+            query: User's natural language query
+            
+        Returns:
+            QueryResult with formatted text and optional chart DataFrame
+        """
+        # Pick up reassigned tool data before defaulting months or naming them
+        self._sync_month_tables()
+        intent, params = self.classify_intent(query)
+        
+        # Different phrasings of the same question share one cached result
+        cache_key = (intent, tuple(sorted(params.items())), self.tools.data_version)
+        if cache_key in self._result_cache:
+            self._result_cache.move_to_end(cache_key)
+            return self._result_cache[cache_key]
+        
+        # Route to appropriate handler (handlers report their own data errors)
+        handler = self._dispatch.get(intent)
+        if handler:
+            result = handler(params)
+        else:
+            result = self._handle_general_query(query)
+        
+        # Data errors may be transient, so only successful results are cached
+        if not result.is_error:
+            self._result_cache[cache_key] = result
+            if len(self._result_cache) > self._RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        
+        return result
+    
+    def clear_cache(self):
+        """Drop cached query responses (call after the underlying data changes)"""
+        self._result_cache.clear()
+    
+    def _handle_revenue_vs_budget(self, params: Dict) -> QueryResult:
         """Handle revenue vs budget queries"""
         month = params.get('specific_month', self._get_latest_month())
         
@@ -206,78 +404,67 @@ class CFOPlanner:
             data = self.tools.get_revenue_vs_budget(month, month)
             
             if data.empty:
-                return f"No revenue data found for {month}."
+                return QueryResult(f"No revenue data found for {month}.")
             
-            row = data.iloc[0]
-            actual = row['actual_usd'] / 1_000_000
-            budget = row['budget_usd'] / 1_000_000
+            actual = data['actual_usd'].iat[0] / 1_000_000
+            budget = data['budget_usd'].iat[0] / 1_000_000
             variance = ((actual - budget) / budget * 100) if budget > 0 else 0
             
-            month_name = datetime.strptime(month, '%Y-%m').strftime('%B %Y')
+            month_name = self._month_name(month, long=True)
             
-            response = f"**Revenue Performance for {month_name}:**\n\n"
-            response += f"• **Actual Revenue:** ${actual:.1f}M\n"
-            response += f"• **Budgeted Revenue:** ${budget:.1f}M\n"
-            response += f"• **Variance:** {variance:+.1f}% "
+            status = _BUDGET_STATUS[int(variance > 0)]
             
-            if variance > 0:
-                response += "🟢 (Above budget)"
-            else:
-                response += "🔴 (Below budget)"
+            parts = [
+                f"**Revenue Performance for {month_name}:**",
+                "",
+                f"• **Actual Revenue:** ${actual:.1f}M",
+                f"• **Budgeted Revenue:** ${budget:.1f}M",
+                f"• **Variance:** {variance:+.1f}% {status}"
+            ]
             
-            return response
+            return QueryResult("\n".join(parts))
             
-        except Exception as e:
-            return f"Error retrieving revenue data: {str(e)}"
+        except _DATA_ERRORS as e:
+            return QueryResult(f"Error retrieving revenue data: {str(e)}", is_error=True)
     
-    def _handle_revenue_trend(self, params: Dict) -> str:
+    def _handle_revenue_trend(self, params: Dict) -> QueryResult:
         """Handle revenue trend queries"""
         try:
             latest_month = self._get_latest_month()
             
-            if params.get('period') == 'last_3_months':
-                start_month, end_month = self._calculate_month_range(3, latest_month)
-            elif params.get('period') == 'last_6_months':
-                start_month, end_month = self._calculate_month_range(6, latest_month)
-            else:
-                # Default to last 6 months
-                start_month, end_month = self._calculate_month_range(6, latest_month)
+            months_back = _PERIOD_MONTHS.get(params.get('period'), _DEFAULT_TREND_MONTHS)
+            start_month, end_month = self._calculate_month_range(months_back, latest_month)
             
             data = self.tools.get_revenue_trend(start_month, end_month)
             
             if data.empty:
-                return "No revenue trend data available."
+                return QueryResult("No revenue trend data available.")
             
-            response = f"**Revenue Trend ({start_month} to {end_month}):**\n\n"
+            parts = [f"**Revenue Trend ({start_month} to {end_month}):**", ""]
             
-            for _, row in data.iterrows():
-                month_name = datetime.strptime(row['month'], '%Y-%m').strftime('%b %Y')
-                revenue = row['revenue_usd'] / 1_000_000
-                response += f"• {month_name}: ${revenue:.1f}M\n"
-            
-           
-
+            labels = self._month_labels(data['month'])
+            revenue_usd = data['revenue_usd'].to_numpy(dtype=np.float64)
+            revenues = revenue_usd / 1_000_000
+            for month_name, revenue in zip(labels, revenues):
+                parts.append(f"• {month_name}: ${revenue:.1f}M")
             
             # Calculate growth
             if len(data) > 1:
-                first_month = data.iloc[0]['revenue_usd']
-                last_month = data.iloc[-1]['revenue_usd']
-                growth = ((last_month - first_month) / first_month * 100) if first_month > 0 else 0
-                response += f"\n**Total Growth:** {growth:+.1f}%"
-            # Attach chart data
-            response += "\nCHART_DATA:" + data.to_json(orient="records")
-            return response
-            
-        except Exception as e:
-            return f"Error retrieving revenue trend: {str(e)}"
+                growth = _growth_pct(revenue_usd)
+                parts.extend(["", f"**Total Growth:** {growth:+.1f}%"])
+            return QueryResult("\n".join(parts), chart_df=data[['month', 'revenue_usd']])
+            
+        except _DATA_ERRORS as e:
+            return QueryResult(f"Error retrieving revenue trend: {str(e)}", is_error=True)
     
-    def _handle_gross_margin(self, params: Dict) -> str:
+    def _handle_gross_margin(self, params: Dict) -> QueryResult:
         """Handle gross margin queries"""
         try:
             latest_month = self._get_latest_month()
             
-            if params.get('period') == 'last_3_months':
-                start_month, end_month = self._calculate_month_range(3, latest_month)
+            months_back = _PERIOD_MONTHS.get(params.get('period'))
+            if months_back:
+                start_month, end_month = self._calculate_month_range(months_back, latest_month)
             else:
                 month = params.get('specific_month', latest_month)
                 start_month = end_month = month
@@ -285,36 +472,38 @@ class CFOPlanner:
             data = self.tools.get_gross_margin_trend(start_month, end_month)
             
             if data.empty:
-                return "No gross margin data available."
+                return QueryResult("No gross margin data available.")
             
             if start_month == end_month:
                 # Single month
-                row = data.iloc[0]
-                month_name = datetime.strptime(row['month'], '%Y-%m').strftime('%B %Y')
-                margin = row['gross_margin_pct']
+                month_name = self._month_name(data['month'].iat[0], long=True)
+                margin = data['gross_margin_pct'].iat[0]
                 
-                response = f"**Gross Margin for {month_name}:** {margin:.1f}%\n\n"
-                response += f"• **Revenue:** ${row['revenue_usd']/1_000_000:.1f}M\n"
-                response += f"• **COGS:** ${row['cogs_usd']/1_000_000:.1f}M"
+                parts = [
+                    f"**Gross Margin for {month_name}:** {margin:.1f}%",
+                    "",
+                    f"• **Revenue:** ${data['revenue_usd'].iat[0]/1_000_000:.1f}M",
+                    f"• **COGS:** ${data['cogs_usd'].iat[0]/1_000_000:.1f}M"
+                ]
             else:
                 # Trend
-                response = f"**Gross Margin Trend ({start_month} to {end_month}):**\n\n"
+                parts = [f"**Gross Margin Trend ({start_month} to {end_month}):**", ""]
                 
-                for _, row in data.iterrows():
-                    month_name = datetime.strptime(row['month'], '%Y-%m').strftime('%b %Y')
-                    margin = row['gross_margin_pct']
-                    response += f"• {month_name}: {margin:.1f}%\n"
+                labels = self._month_labels(data['month'])
+                margins = data['gross_margin_pct'].to_numpy(dtype=np.float64)
+                for month_name, margin in zip(labels, margins):
+                    parts.append(f"• {month_name}: {margin:.1f}%")
                 
                 # Average margin
-                avg_margin = data['gross_margin_pct'].mean()
-                response += f"\n**Average Margin:** {avg_margin:.1f}%"
+                avg_margin = margins.mean()
+                parts.extend(["", f"**Average Margin:** {avg_margin:.1f}%"])
             
-            return response
+            return QueryResult("\n".join(parts))
             
-        except Exception as e:
-            return f"Error retrieving gross margin data: {str(e)}"
+        except _DATA_ERRORS as e:
+            return QueryResult(f"Error retrieving gross margin data: {str(e)}", is_error=True)
     
-    def _handle_opex_breakdown(self, params: Dict) -> str:
+    def _handle_opex_breakdown(self, params: Dict) -> QueryResult:
         """Handle operating expense breakdown queries"""
         month = params.get('specific_month', self._get_latest_month())
         
@@ -322,136 +511,119 @@ class CFOPlanner:
             data = self.tools.get_opex_breakdown(month)
             
             if data.empty:
-                return f"No operating expense data found for {month}."
-            
-            month_name = datetime.strptime(month, '%Y-%m').strftime('%B %Y')
-            total_opex = data['amount_usd'].sum() / 1_000_000
-            
-            response = f"**Operating Expenses for {month_name}:**\n\n"
-            response += f"**Total OpEx:** ${total_opex:.1f}M\n\n"
-            response += "**Breakdown by Category:**\n"
+                return QueryResult(f"No operating expense data found for {month}.")
+            
+            month_name = self._month_name(month, long=True)
+            total = data['amount_usd'].sum()
+            total_opex = total / 1_000_000
+            
+            parts = [
+                f"**Operating Expenses for {month_name}:**",
+                "",
+                f"**Total OpEx:** ${total_opex:.1f}M",
+                "",
+                "**Breakdown by Category:**"
+            ]
             
             # Sort by amount descending
             data_sorted = data.sort_values('amount_usd', ascending=False)
             
-            for _, row in data_sorted.iterrows():
-                category = row['category']
-                amount = row['amount_usd'] / 1_000_000
-                percentage = (row['amount_usd'] / data['amount_usd'].sum()) * 100
-                response += f"• **{category}:** ${amount:.1f}M ({percentage:.1f}%)\n"
+            amounts_usd = data_sorted['amount_usd'].to_numpy()
+            parts.extend(
+                f"• **{category}:** ${amount:.1f}M ({percentage:.1f}%)"
+                for category, amount, percentage in zip(
+                    data_sorted['category'].to_numpy(),
+                    amounts_usd / 1_000_000,
+                    amounts_usd * (100.0 / total)
+                )
+            )
             
-            return response
+            return QueryResult("\n".join(parts))
             
-        except Exception as e:
-            return f"Error retrieving OpEx breakdown: {str(e)}"
+        except _DATA_ERRORS as e:
+            return QueryResult(f"Error retrieving OpEx breakdown: {str(e)}", is_error=True)
     
-    def _handle_cash_runway(self, params: Dict) -> str:
+    def _handle_cash_runway(self, params: Dict) -> QueryResult:
         """Handle cash runway queries"""
         try:
-            runway_months = self.tools.get_cash_runway()
-            current_cash = self.tools.get_current_cash_balance()
-            burn_rate = self.tools.get_average_burn_rate()
+            runway_months, current_cash, burn_rate = self.tools.get_cash_snapshot()
             
-            response = "**Cash Runway Analysis:**\n\n"
+            parts = ["**Cash Runway Analysis:**", ""]
             
             if runway_months:
-                response += f"• **Current Runway:** {runway_months:.1f} months\n"
-                
-                if runway_months < 6:
-                    response += "• **Status:** 🔴 Critical - Consider fundraising\n"
-                elif runway_months < 12:
-                    response += "• **Status:** 🟡 Caution - Monitor closely\n"
-                else:
-                    response += "• **Status:** 🟢 Healthy\n"
+                parts.append(f"• **Current Runway:** {runway_months:.1f} months")
+                status = _RUNWAY_STATUS[bisect_right(_RUNWAY_THRESHOLDS, runway_months)]
+                parts.append(f"• **Status:** {status}")
             
             if current_cash:
-                response += f"• **Current Cash:** ${current_cash/1_000_000:.1f}M\n"
+                parts.append(f"• **Current Cash:** ${current_cash/1_000_000:.1f}M")
             
             if burn_rate:
-                response += f"• **Avg Monthly Burn:** ${abs(burn_rate)/1_000_000:.1f}M\n"
+                parts.append(f"• **Avg Monthly Burn:** ${abs(burn_rate)/1_000_000:.1f}M")
             
-            return response
+            return QueryResult("\n".join(parts))
             
-        except Exception as e:
-            return f"Error calculating cash runway: {str(e)}"
+        except _DATA_ERRORS as e:
+            return QueryResult(f"Error calculating cash runway: {str(e)}", is_error=True)
     
-    def _handle_cash_trend(self, params: Dict) -> str:
+    def _handle_cash_trend(self, params: Dict) -> QueryResult:
         """Handle cash trend queries"""
         try:
             latest_month = self._get_latest_month()
             
-            if params.get('period') == 'last_6_months':
-                start_month, end_month = self._calculate_month_range(6, latest_month)
-            else:
-                # Default to last 6 months
-                start_month, end_month = self._calculate_month_range(6, latest_month)
+            months_back = _PERIOD_MONTHS.get(params.get('period'), _DEFAULT_TREND_MONTHS)
+            start_month, end_month = self._calculate_month_range(months_back, latest_month)
             
             data = self.tools.get_cash_trend(start_month, end_month)
             
             if data.empty:
-                return "No cash trend data available."
+                return QueryResult("No cash trend data available.")
             
-            response = f"**Cash Balance Trend ({start_month} to {end_month}):**\n\n"
+            parts = [f"**Cash Balance Trend ({start_month} to {end_month}):**", ""]
             
-            for _, row in data.iterrows():
-                month_name = datetime.strptime(row['month'], '%Y-%m').strftime('%b %Y')
-                balance = row['cash_balance_usd'] / 1_000_000
-                response += f"• {month_name}: ${balance:.1f}M\n"
+            labels = self._month_labels(data['month'])
+            balance_usd = data['cash_balance_usd'].to_numpy(dtype=np.float64)
+            balances = balance_usd / 1_000_000
+            for month_name, balance in zip(labels, balances):
+                parts.append(f"• {month_name}: ${balance:.1f}M")
             
             # Calculate net change
             if len(data) > 1:
-                first_balance = data.iloc[0]['cash_balance_usd']
-                last_balance = data.iloc[-1]['cash_balance_usd']
-                net_change = (last_balance - first_balance) / 1_000_000
-                response += f"\n**Net Change:** ${net_change:+.1f}M"
+                net_change = (balance_usd[-1] - balance_usd[0]) / 1_000_000
+                parts.extend(["", f"**Net Change:** ${net_change:+.1f}M"])
             
-            return response
+            return QueryResult("\n".join(parts))
             
-        except Exception as e:
-            return f"Error retrieving cash trend: {str(e)}"
+        except _DATA_ERRORS as e:
+            return QueryResult(f"Error retrieving cash trend: {str(e)}", is_error=True)
     
-    def _handle_ebitda(self, params: Dict) -> str:
+    def _handle_ebitda(self, params: Dict) -> QueryResult:
         """Handle EBITDA queries"""
         month = params.get('specific_month', self._get_latest_month())
         
         try:
             ebitda_data = self.tools.get_ebitda(month)
             
-            if not ebitda_data:
-                return f"No EBITDA data available for {month}."
-            
-            month_name = datetime.strptime(month, '%Y-%m').strftime('%B %Y')
+            month_name = self._month_name(month, long=True)
             
-            response = f"**EBITDA for {month_name}:**\n\n"
-            response += f"• **Revenue:** ${ebitda_data['revenue']/1_000_000:.1f}M\n"
-            response += f"• **COGS:** ${ebitda_data['cogs']/1_000_000:.1f}M\n"
-            response += f"• **OpEx:** ${ebitda_data['opex']/1_000_000:.1f}M\n"
-            response += f"• **EBITDA:** ${ebitda_data['ebitda']/1_000_000:.1f}M\n\n"
+            parts = [
+                f"**EBITDA for {month_name}:**",
+                "",
+                f"• **Revenue:** ${ebitda_data['revenue']/1_000_000:.1f}M",
+                f"• **COGS:** ${ebitda_data['cogs']/1_000_000:.1f}M",
+                f"• **OpEx:** ${ebitda_data['opex']/1_000_000:.1f}M",
+                f"• **EBITDA:** ${ebitda_data['ebitda']/1_000_000:.1f}M"
+            ]
             
             if ebitda_data['revenue'] > 0:
                 ebitda_margin = (ebitda_data['ebitda'] / ebitda_data['revenue']) * 100
-                response += f"**EBITDA Margin:** {ebitda_margin:.1f}%"
+                parts.extend(["", f"**EBITDA Margin:** {ebitda_margin:.1f}%"])
             
-            return response
+            return QueryResult("\n".join(parts))
             
-        except Exception as e:
-            return f"Error calculating EBITDA: {str(e)}"
+        except _DATA_ERRORS as e:
+            return QueryResult(f"Error calculating EBITDA: {str(e)}", is_error=True)
     
-    def _handle_general_query(self, query: str) -> str:
+    def _handle_general_query(self, query: str) -> QueryResult:
         """Handle general queries that don't match specific intents"""
-        response = "I can help you with various financial analyses. Here are some things you can ask:\n\n"
-        response += "📊 **Revenue Analysis:**\n"
-        response += "• 'What was June 2025 revenue vs budget?'\n"
-        response += "• 'Show revenue trend for last 3 months'\n\n"
-        response += "💰 **Profitability:**\n"
-        response += "• 'What's our gross margin for June?'\n"
-        response += "• 'Show EBITDA for this month'\n\n"
-        response += "💸 **Expenses:**\n"
-        response += "• 'Break down OpEx by category'\n"
-        response += "• 'How much did we spend on R&D?'\n\n"
-        response += "🏦 **Cash Management:**\n"
-        response += "• 'What is our cash runway?'\n"
-        response += "• 'Show cash trend over 6 months'\n\n"
-        response += "Try asking one of these questions!"
-        
-        return response
+        return QueryResult(_GENERAL_HELP)
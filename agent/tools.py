@@ -1,13 +1,102 @@
 import pandas as pd
+from bisect import bisect_left, bisect_right
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+# Low-cardinality label columns stored as categoricals. Month stays a YYYY-MM
+# string because it is range-sliced, which sorted string indexes support directly.
+_LABEL_COLUMNS = ('entity', 'account_category', 'currency')
+
+def _normalize_months(months: pd.Series) -> pd.Series:
+    """
+    Convert a month column to YYYY-MM strings, leaving missing values as NaN
+    
+    Tz-naive datetime64 columns are cast to month precision in one NumPy
+    operation, and columns holding only strings that start with YYYY-MM are
+    sliced. Anything else (Timestamps in object columns, mixed values,
+    tz-aware datetimes) goes through pd.to_datetime in local wall time.
+    """
+    if pd.api.types.is_datetime64_dtype(months):
+        result = pd.Series(months.to_numpy().astype('datetime64[M]').astype(str), index=months.index)
+        return result.where(months.notna())
+    
+    if pd.api.types.infer_dtype(months, skipna=True) == 'string':
+        sliced = months.str.slice(0, 7)
+        if sliced.dropna().str.fullmatch(r'\d{4}-\d{2}').all():
+            return sliced
+    
+    parsed = pd.to_datetime(months)
+    if parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.dt.strftime('%Y-%m')
+
+def _safe_pct(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise numerator / denominator * 100, with 0 where the denominator is 0"""
+    pct = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator * 100, denominator, out=pct, where=denominator != 0)
+    return pct
+
+def _prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy a source frame into the shape the tools expect
+    
+    Months become YYYY-MM strings, rows without a parseable month are
+    dropped, and label columns are stored as categoricals.
+    """
+    prepared = df.copy()
+    
+    # Ensure the month column is strings in YYYY-MM format
+    prepared['month'] = _normalize_months(prepared['month'])
+    
+    # Drop any rows that failed to parse (avoids None values)
+    prepared = prepared.dropna(subset=['month'])
+    
+    # Store label columns as categoricals so grouping and matching use integer codes
+    for col in _LABEL_COLUMNS:
+        if col in prepared.columns:
+            prepared[col] = prepared[col].astype('category')
+    
+    return prepared
+
+def _source_frame(name: str) -> property:
+    """
+    Property for one of the source frames held by FinancialTools
+    
+    Reassigning the frame normalizes it like __init__ does and re-runs
+    preprocessing, so the precomputed views and data_version always
+    describe the current data.
+    """
+    attr = f'_{name}'
+    
+    def fget(self) -> pd.DataFrame:
+        return getattr(self, attr)
+    
+    def fset(self, df: pd.DataFrame):
+        # Normalize before touching the instance so a bad frame leaves it unchanged
+        prepared = _prepare_frame(df)
+        previous = getattr(self, attr)
+        setattr(self, attr, prepared)
+        try:
+            self._preprocess_data()
+        except Exception:
+            # Roll back so the derived views keep describing the previous data
+            setattr(self, attr, previous)
+            self._preprocess_data()
+            raise
+    
+    return property(fget, fset, doc=f"Source {name} data; assigning refreshes derived views")
+
 class FinancialTools:
     """
     Financial calculation tools for CFO Copilot
     """
     
+    actuals = _source_frame('actuals')
+    budget = _source_frame('budget')
+    fx = _source_frame('fx')
+    cash = _source_frame('cash')
+    
     def __init__(self, actuals_df: pd.DataFrame, budget_df: pd.DataFrame, 
                  fx_df: pd.DataFrame, cash_df: pd.DataFrame):
         """
@@ -19,40 +108,148 @@ class FinancialTools:
             fx_df: Foreign exchange rates (month, currency, rate_to_usd)
             cash_df: Cash balance data (month, entity, cash_usd)
         """
-        self.actuals = actuals_df.copy()
-        self.budget = budget_df.copy()
-        self.fx = fx_df.copy()
-        self.cash = cash_df.copy()
-        
-        # Ensure month columns are strings in YYYY-MM format
-        self.actuals['month'] = pd.to_datetime(self.actuals['month']).dt.strftime('%Y-%m')
-        self.budget['month'] = pd.to_datetime(self.budget['month']).dt.strftime('%Y-%m')
-        self.fx['month'] = pd.to_datetime(self.fx['month']).dt.strftime('%Y-%m')
-        self.cash['month'] = pd.to_datetime(self.cash['month']).dt.strftime('%Y-%m')
-        
-        # Ensure all month values are normalized to strings
-        # self.actuals['month'] = pd.to_datetime(self.actuals['month'], errors="coerce").dt.strftime('%Y-%m')
-        # self.budget['month'] = pd.to_datetime(self.budget['month'], errors="coerce").dt.strftime('%Y-%m')
-        # self.fx['month'] = pd.to_datetime(self.fx['month'], errors="coerce").dt.strftime('%Y-%m')
-        # self.cash['month'] = pd.to_datetime(self.cash['month'], errors="coerce").dt.strftime('%Y-%m')
-
-        # Drop any rows that failed to parse (avoids None values)
-        self.actuals = self.actuals.dropna(subset=['month'])
-        self.budget = self.budget.dropna(subset=['month'])
-        self.fx = self.fx.dropna(subset=['month'])
-        self.cash = self.cash.dropna(subset=['month'])
-        # Get available months
-        self.month_columns = sorted(self.actuals['month'].unique())
-        
-        # Create FX lookup dictionary for faster access
+        # Set the backing frames directly; preprocessing runs once at the end
+        self._actuals = _prepare_frame(actuals_df)
+        self._budget = _prepare_frame(budget_df)
+        self._fx = _prepare_frame(fx_df)
+        self._cash = _prepare_frame(cash_df)
+        
+        self._preprocess_data()
+    
+    def _preprocess_data(self):
+        """
+        Precompute the views every query reads from
+        
+        Actuals and budget are converted to USD once and summed into ledgers
+        indexed by (account_category, month); cash is summed per month. Tool
+        methods slice these instead of re-filtering and re-converting rows.
+        """
+        # Get available months (sorted, so month windows can be bisected)
+        self.month_columns = tuple(sorted(self._actuals['month'].unique()))
+        
+        # Create FX lookup for vectorized conversion
         self._create_fx_lookup()
+        
+        self._actuals_ledger = self._build_ledger(self._actuals)
+        self._budget_ledger = self._build_ledger(self._budget)
+        self._opex_ledger = self._opex_by_category(self._actuals_ledger)
+        self._opex_by_month = self._opex_ledger.groupby(level='month').sum()
+        
+        # Per-row OpEx subcategory names ('Opex:R&D' -> 'R&D'), derived once per category
+        opex_index = self._opex_ledger.index.remove_unused_levels()
+        subcategories = opex_index.levels[0].astype(str).str.replace('Opex:', '')
+        self._opex_subcategories = subcategories[opex_index.codes[0]]
+        
+        # Monthly P&L lines behind EBITDA; months missing a line count as 0
+        self._pnl_by_month = pd.concat({
+            'revenue': self._category_totals(self._actuals_ledger, 'Revenue'),
+            'cogs': self._category_totals(self._actuals_ledger, 'COGS'),
+            'opex': self._opex_by_month
+        }, axis=1).fillna(0.0)
+        
+        # Total cash per month across entities, in month order
+        self._cash_by_month = self._cash.groupby('month', sort=True)['cash_usd'].sum()
+        
+        # Fingerprint of the loaded data, used to key caches built on these tools
+        self.data_version = self._compute_data_version()
+    
+    def _build_ledger(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Sum a ledger frame into USD totals per account category and month
+        
+        Args:
+            df: DataFrame with columns: month, account_category, amount, currency
+            
+        Returns:
+            Series of amount_usd indexed by (account_category, month), sorted
+        """
+        # Group the USD amounts by the frame's own key columns; no converted copy of the frame
+        amount_usd = pd.Series(self._usd_amounts(df), index=df.index, name='amount_usd')
+        # observed=True keeps categorical account columns to the groups actually present
+        return amount_usd.groupby([df['account_category'], df['month']], sort=True, observed=True).sum()
+    
+    def _category_totals(self, ledger: pd.Series, category: str) -> pd.Series:
+        """
+        Monthly USD totals for one account category
+        
+        Args:
+            ledger: Ledger built by _build_ledger
+            category: Account category, e.g. 'Revenue'
+            
+        Returns:
+            Series of amount_usd indexed by month (empty if the category has no data)
+        """
+        if category not in ledger.index.get_level_values('account_category'):
+            return pd.Series(dtype=np.float64, name='amount_usd', index=pd.Index([], name='month'))
+        return ledger.xs(category, level='account_category')
+    
+    def _window(self, ledger: pd.Series, category: str, start_month: str, end_month: str) -> pd.Series:
+        """
+        Monthly USD totals for one account category over an inclusive month range
+        
+        Args:
+            ledger: Ledger built by _build_ledger
+            category: Account category, e.g. 'Revenue'
+            start_month: Start month in YYYY-MM format
+            end_month: End month in YYYY-MM format
+            
+        Returns:
+            Series of amount_usd indexed by month (empty if the category has no data)
+        """
+        return self._category_totals(ledger, category).loc[start_month:end_month]
+    
+    def _align_months(self, *series: pd.Series) -> Tuple[pd.Index, List[np.ndarray]]:
+        """
+        Align month-indexed series on the sorted union of their months
+        
+        Args:
+            series: Series indexed by YYYY-MM month
+            
+        Returns:
+            Tuple of (months, one float64 array per series with 0 for missing months)
+        """
+        months = series[0].index
+        for other in series[1:]:
+            months = months.union(other.index)
+        return months, [s.reindex(months, fill_value=0.0).to_numpy(dtype=np.float64) for s in series]
+    
+    def _months_between(self, start_month: str, end_month: str) -> Tuple[str, ...]:
+        """Available months within an inclusive YYYY-MM range, in order"""
+        lo = bisect_left(self.month_columns, start_month)
+        hi = bisect_right(self.month_columns, end_month)
+        return self.month_columns[lo:hi]
+    
+    def _opex_by_category(self, ledger: pd.Series) -> pd.Series:
+        """OpEx rows of a ledger (account categories starting with 'Opex:')"""
+        # Classify each distinct category once, then broadcast through the level codes
+        categories = ledger.index.levels[0]
+        is_opex = np.asarray(categories.astype(str).str.startswith('Opex:'), dtype=bool)
+        return ledger[is_opex[ledger.index.codes[0]]]
+    
+    def _compute_data_version(self) -> int:
+        """Hash the contents of all loaded frames into a single version key"""
+        frame_hashes = tuple(
+            int(pd.util.hash_pandas_object(df, index=False).sum())
+            for df in (self._actuals, self._budget, self._fx, self._cash)
+        )
+        return hash(frame_hashes)
     
     def _create_fx_lookup(self):
-        """Create a dictionary for fast FX rate lookup"""
-        self.fx_lookup = {}
-        for _, row in self.fx.iterrows():
-            key = (row['month'], row['currency'])
-            self.fx_lookup[key] = row['rate_to_usd']
+        """Index FX rates by (month, currency) for vectorized lookup"""
+        # Later rows win for duplicate keys
+        fx_rates = self._fx.drop_duplicates(subset=['month', 'currency'], keep='last')
+        
+        # Blank or zero rates are unusable; treat them like a missing rate (1.0)
+        rates = fx_rates['rate_to_usd'].to_numpy(dtype=np.float64)
+        rates = np.where(np.isnan(rates) | (rates == 0), 1.0, rates)
+        
+        self.fx_lookup = pd.Series(
+            rates,
+            index=pd.MultiIndex.from_arrays([
+                fx_rates['month'].astype(str).to_numpy(),
+                fx_rates['currency'].astype(str).to_numpy()
+            ])
+        )
     
     def _convert_to_usd(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -65,22 +262,26 @@ class FinancialTools:
             DataFrame with additional amount_usd column
         """
         result_df = df.copy()
+        result_df['amount_usd'] = self._usd_amounts(df)
+        return result_df
+    
+    def _usd_amounts(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        USD value of each row's amount, aligned with the rows of df
         
-        # Initialize amount_usd column
-        result_df['amount_usd'] = 0.0
-        
-        for idx, row in result_df.iterrows():
-            month = row['month']
-            currency = row['currency']
-            amount = row['amount']
-            
-            # Get FX rate
-            fx_rate = self.fx_lookup.get((month, currency), 1.0)
+        Args:
+            df: DataFrame with columns: month, currency, amount
             
-            # Convert to USD
-            result_df.loc[idx, 'amount_usd'] = amount * fx_rate
-        
-        return result_df
+        Returns:
+            float64 array of amount * rate_to_usd (missing rates count as 1.0)
+        """
+        # One index lookup for every row
+        keys = pd.MultiIndex.from_arrays([
+            df['month'].astype(str).to_numpy(),
+            df['currency'].astype(str).to_numpy()
+        ])
+        fx_rates = self.fx_lookup.reindex(keys).fillna(1.0).to_numpy()
+        return df['amount'].to_numpy(dtype=np.float64) * fx_rates
     
     def get_revenue_vs_budget(self, start_month: str, end_month: str) -> pd.DataFrame:
         """
@@ -93,271 +294,154 @@ class FinancialTools:
         Returns:
             DataFrame with actual and budget revenue in USD
         """
-        # Filter for revenue accounts
-        revenue_actuals = self.actuals[
-            (self.actuals['account_category'] == 'Revenue') &
-            (self.actuals['month'] >= start_month) &
-            (self.actuals['month'] <= end_month)
-        ].copy()
-        
-        revenue_budget = self.budget[
-            (self.budget['account_category'] == 'Revenue') &
-            (self.budget['month'] >= start_month) &
-            (self.budget['month'] <= end_month)
-        ].copy()
-        
-        # Convert to USD
-        revenue_actuals_usd = self._convert_to_usd(revenue_actuals)
-        revenue_budget_usd = self._convert_to_usd(revenue_budget)
-        
-        # Group by month
-        actuals_by_month = revenue_actuals_usd.groupby('month')['amount_usd'].sum().reset_index()
-        actuals_by_month.columns = ['month', 'actual_usd']
-        
-        budget_by_month = revenue_budget_usd.groupby('month')['amount_usd'].sum().reset_index()
-        budget_by_month.columns = ['month', 'budget_usd']
-        
-        # Merge
-        result = pd.merge(actuals_by_month, budget_by_month, on='month', how='outer')
-        result = result.fillna(0)
+        actual = self._window(self._actuals_ledger, 'Revenue', start_month, end_month)
+        budget = self._window(self._budget_ledger, 'Revenue', start_month, end_month)
         
-        # Calculate variance
-        result['variance_usd'] = result['actual_usd'] - result['budget_usd']
-        result['variance_pct'] = (result['variance_usd'] / result['budget_usd'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
+        months, (actual, budget) = self._align_months(actual, budget)
         
-        return result.sort_values('month')
+        # Calculate variance
+        variance = actual - budget
+        
+        return pd.DataFrame({
+            'month': months,
+            'actual_usd': actual,
+            'budget_usd': budget,
+            'variance_usd': variance,
+            'variance_pct': _safe_pct(variance, budget)
+        })
     
     def get_revenue_trend(self, start_month: str, end_month: str) -> pd.DataFrame:
         """Get revenue trend over time"""
-        revenue_actuals = self.actuals[
-            (self.actuals['account_category'] == 'Revenue') &
-            (self.actuals['month'] >= start_month) &
-            (self.actuals['month'] <= end_month)
-        ].copy()
-        
-        # Convert to USD
-        revenue_actuals_usd = self._convert_to_usd(revenue_actuals)
-        
-        # Group by month
-        result = revenue_actuals_usd.groupby('month')['amount_usd'].sum().reset_index()
-        result.columns = ['month', 'revenue_usd']
-        
-        return result.sort_values('month')
+        revenue = self._window(self._actuals_ledger, 'Revenue', start_month, end_month)
+        return revenue.rename('revenue_usd').reset_index()
     
     def get_gross_margin_trend(self, start_month: str, end_month: str) -> pd.DataFrame:
         """Calculate gross margin trend"""
-        # Get revenue
-        revenue_actuals = self.actuals[
-            (self.actuals['account_category'] == 'Revenue') &
-            (self.actuals['month'] >= start_month) &
-            (self.actuals['month'] <= end_month)
-        ].copy()
-        
-        # Get COGS
-        cogs_actuals = self.actuals[
-            (self.actuals['account_category'] == 'COGS') &
-            (self.actuals['month'] >= start_month) &
-            (self.actuals['month'] <= end_month)
-        ].copy()
-        
-        # Convert to USD
-        revenue_usd = self._convert_to_usd(revenue_actuals)
-        cogs_usd = self._convert_to_usd(cogs_actuals)
-        
-        # Group by month
-        revenue_by_month = revenue_usd.groupby('month')['amount_usd'].sum().reset_index()
-        revenue_by_month.columns = ['month', 'revenue_usd']
-        
-        cogs_by_month = cogs_usd.groupby('month')['amount_usd'].sum().reset_index()
-        cogs_by_month.columns = ['month', 'cogs_usd']
+        revenue = self._window(self._actuals_ledger, 'Revenue', start_month, end_month)
+        cogs = self._window(self._actuals_ledger, 'COGS', start_month, end_month)
         
-        # Merge and calculate margin
-        result = pd.merge(revenue_by_month, cogs_by_month, on='month', how='outer')
-        result = result.fillna(0)
+        months, (revenue, cogs) = self._align_months(revenue, cogs)
         
-        result['gross_profit_usd'] = result['revenue_usd'] - result['cogs_usd']
-        result['gross_margin_pct'] = (result['gross_profit_usd'] / result['revenue_usd'] * 100).replace([np.inf, -np.inf], 0).fillna(0)
+        # Calculate margin
+        gross_profit = revenue - cogs
         
-        return result.sort_values('month')
+        return pd.DataFrame({
+            'month': months,
+            'revenue_usd': revenue,
+            'cogs_usd': cogs,
+            'gross_profit_usd': gross_profit,
+            'gross_margin_pct': _safe_pct(gross_profit, revenue)
+        })
     
     def get_opex_breakdown(self, month: str) -> pd.DataFrame:
         """Get operating expense breakdown by category"""
-        # Filter for OpEx accounts (those starting with 'Opex:')
-        opex_actuals = self.actuals[
-            (self.actuals['account_category'].str.startswith('Opex:', na=False)) &
-            (self.actuals['month'] == month)
-        ].copy()
+        in_month = self._opex_ledger.index.get_level_values('month') == month
         
-        if opex_actuals.empty:
+        if not in_month.any():
             return pd.DataFrame()
         
-        # Convert to USD
-        opex_usd = self._convert_to_usd(opex_actuals)
-        
-        # Extract category (everything after 'Opex:')
-        opex_usd['category'] = opex_usd['account_category'].str.replace('Opex:', '')
-        
-        # Group by category
-        result = opex_usd.groupby('category')['amount_usd'].sum().reset_index()
-        result.columns = ['category', 'amount_usd']
+        result = pd.DataFrame({
+            'category': self._opex_subcategories[in_month],
+            'amount_usd': self._opex_ledger.to_numpy()[in_month]
+        })
         result['month'] = month
         
         return result.sort_values('amount_usd', ascending=False)
     
     def get_opex_trend(self, start_month: str, end_month: str) -> pd.DataFrame:
         """Get total OpEx trend over time"""
-        opex_actuals = self.actuals[
-            (self.actuals['account_category'].str.startswith('Opex:', na=False)) &
-            (self.actuals['month'] >= start_month) &
-            (self.actuals['month'] <= end_month)
-        ].copy()
-        
-        # Convert to USD
-        opex_usd = self._convert_to_usd(opex_actuals)
-        
-        # Group by month
-        result = opex_usd.groupby('month')['amount_usd'].sum().reset_index()
-        result.columns = ['month', 'opex_usd']
-        
-        return result.sort_values('month')
+        result = self._opex_by_month.loc[start_month:end_month]
+        return result.rename('opex_usd').reset_index()
     
     def get_cash_runway(self) -> Optional[float]:
         """Calculate cash runway in months"""
-        try:
-            current_cash = self.get_current_cash_balance()
-            avg_burn = self.get_average_burn_rate(months=3)
-            
-            if current_cash and avg_burn and avg_burn < 0:
-                runway_months = current_cash / abs(avg_burn)
-                return runway_months
-            
-            return None
+        runway_months, _, _ = self.get_cash_snapshot()
+        return runway_months
+    
+    def get_cash_snapshot(self, months: int = 3) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """
+        Calculate runway, current balance and average burn from the monthly cash totals
+        
+        Args:
+            months: Number of trailing months to average the burn rate over
             
-        except Exception as e:
-            print(f"Error calculating cash runway: {e}")
-            return None
+        Returns:
+            Tuple of (runway in months, current cash in USD, average monthly change in USD).
+            Each value is None when it cannot be calculated.
+        """
+        if self._cash_by_month.empty:
+            return None, None, None
+        
+        balances = self._cash_by_month.to_numpy(dtype=np.float64)
+        current_cash = float(balances[-1])
+        
+        # Need at least two of the last N months to measure a change
+        recent = balances[-months:]
+        if len(recent) < 2:
+            return None, current_cash, None
+        
+        # Average monthly change over the last N months (negative = burn);
+        # the mean of consecutive differences telescopes to (last - first) / steps
+        avg_burn = float((recent[-1] - recent[0]) / (len(recent) - 1))
+        
+        runway_months = None
+        if current_cash and avg_burn < 0:
+            runway_months = current_cash / abs(avg_burn)
+        
+        return runway_months, current_cash, avg_burn
     
     def get_current_cash_balance(self) -> Optional[float]:
         """Get current cash balance in USD"""
-        try:
-            if self.cash.empty:
-                return None
-            
-            # Get the latest month
-            latest_month = self.cash['month'].max()
-            
-            # Sum cash across all entities for the latest month
-            current_cash = self.cash[self.cash['month'] == latest_month]['cash_usd'].sum()
-            
-            return current_cash
-            
-        except Exception as e:
-            print(f"Error getting current cash balance: {e}")
-            return None
+        _, current_cash, _ = self.get_cash_snapshot()
+        return current_cash
     
     def get_average_burn_rate(self, months: int = 3) -> Optional[float]:
         """Calculate average monthly burn rate over specified months"""
-        try:
-            if self.cash.empty:
-                return None
-            
-            # Get unique months sorted
-            unique_months = sorted(self.cash['month'].unique())
-            
-            if len(unique_months) < 2:
-                return None
-            
-            # Get last N months
-            last_n_months = unique_months[-months:]
-            
-            # Calculate cash balances for these months
-            cash_balances = []
-            for month in last_n_months:
-                balance = self.cash[self.cash['month'] == month]['cash_usd'].sum()
-                cash_balances.append(balance)
-            
-            if len(cash_balances) < 2:
-                return None
-            
-            # Calculate monthly changes
-            monthly_changes = []
-            for i in range(1, len(cash_balances)):
-                change = cash_balances[i] - cash_balances[i-1]
-                monthly_changes.append(change)
-            
-            # Return average monthly change (negative = burn)
-            return np.mean(monthly_changes)
-            
-        except Exception as e:
-            print(f"Error calculating burn rate: {e}")
-            return None
+        _, _, avg_burn = self.get_cash_snapshot(months)
+        return avg_burn
     
     def get_cash_trend(self, start_month: str, end_month: str) -> pd.DataFrame:
         """Get cash balance trend"""
-        cash_filtered = self.cash[
-            (self.cash['month'] >= start_month) &
-            (self.cash['month'] <= end_month)
-        ].copy()
-        
-        # Group by month (in case there are multiple entities)
-        result = cash_filtered.groupby('month')['cash_usd'].sum().reset_index()
-        result.columns = ['month', 'cash_balance_usd']
-        
-        return result.sort_values('month')
+        result = self._cash_by_month.loc[start_month:end_month]
+        return result.rename('cash_balance_usd').reset_index()
     
-    def get_ebitda(self, month: str) -> Optional[Dict[str, float]]:
+    def get_ebitda(self, month: str) -> Dict[str, float]:
         """Calculate EBITDA for a given month"""
-        try:
-            # Revenue
-            revenue_actuals = self.actuals[
-                (self.actuals['account_category'] == 'Revenue') &
-                (self.actuals['month'] == month)
-            ].copy()
-            revenue_usd = self._convert_to_usd(revenue_actuals)
-            revenue = revenue_usd['amount_usd'].sum()
-            
-            # COGS
-            cogs_actuals = self.actuals[
-                (self.actuals['account_category'] == 'COGS') &
-                (self.actuals['month'] == month)
-            ].copy()
-            cogs_usd = self._convert_to_usd(cogs_actuals)
-            cogs = cogs_usd['amount_usd'].sum()
-            
-            # OpEx
-            opex_actuals = self.actuals[
-                (self.actuals['account_category'].str.startswith('Opex:', na=False)) &
-                (self.actuals['month'] == month)
-            ].copy()
-            opex_usd = self._convert_to_usd(opex_actuals)
-            opex = opex_usd['amount_usd'].sum()
-            
-            # EBITDA = Revenue - COGS - OpEx (simplified, ignoring D&A)
-            ebitda = revenue - cogs - opex
-            
-            return {
-                'revenue': revenue,
-                'cogs': cogs,
-                'opex': opex,
-                'ebitda': ebitda,
-                'month': month
-            }
-            
-        except Exception as e:
-            print(f"Error calculating EBITDA: {e}")
-            return None
+        if month in self._pnl_by_month.index:
+            revenue = self._pnl_by_month.at[month, 'revenue']
+            cogs = self._pnl_by_month.at[month, 'cogs']
+            opex = self._pnl_by_month.at[month, 'opex']
+        else:
+            revenue = cogs = opex = 0.0
+        
+        # EBITDA = Revenue - COGS - OpEx (simplified, ignoring D&A)
+        ebitda = revenue - cogs - opex
+        
+        return {
+            'revenue': revenue,
+            'cogs': cogs,
+            'opex': opex,
+            'ebitda': ebitda,
+            'month': month
+        }
     
     def get_ebitda_trend(self, start_month: str, end_month: str) -> pd.DataFrame:
         """Get EBITDA trend over time"""
-        months = [m for m in self.month_columns if start_month <= m <= end_month]
-        
-        results = []
-        for month in months:
-            ebitda_data = self.get_ebitda(month)
-            if ebitda_data:
-                results.append(ebitda_data)
+        months = self._months_between(start_month, end_month)
         
-        if results:
-            return pd.DataFrame(results)
-        else:
+        if not months:
             return pd.DataFrame()
+        
+        # Align to the month list; months without data count as 0
+        pnl = self._pnl_by_month.reindex(months, fill_value=0.0)
+        revenue = pnl['revenue'].to_numpy(dtype=np.float64)
+        cogs = pnl['cogs'].to_numpy(dtype=np.float64)
+        opex = pnl['opex'].to_numpy(dtype=np.float64)
+        
+        return pd.DataFrame({
+            'revenue': revenue,
+            'cogs': cogs,
+            'opex': opex,
+            'ebitda': revenue - cogs - opex,
+            'month': list(months)
+        })
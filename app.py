@@ -1,15 +1,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
-import os
-import sys
 from pathlib import Path
-import json
-
-# Add the agent directory to the Python path
-sys.path.append(str(Path(__file__).parent / "agent"))
 
 from agent.planner import CFOPlanner
 from agent.tools import FinancialTools
@@ -23,7 +16,7 @@ st.set_page_config(
 )
 
 # Custom CSS 
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -55,7 +48,7 @@ st.markdown("""
         border-left: 4px solid #1E88E5;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 @st.cache_data
 def load_financial_data():
@@ -63,11 +56,21 @@ def load_financial_data():
     try:
         fixtures_path = Path(__file__).parent / "fixtures"
         
-        # Load CSV files
-        actuals = pd.read_csv(fixtures_path / "actuals.csv")
-        budget = pd.read_csv(fixtures_path / "budget.csv") 
-        fx = pd.read_csv(fixtures_path / "fx.csv")
-        cash = pd.read_csv(fixtures_path / "cash.csv")
+        # Load CSV files with explicit dtypes so pandas skips type inference
+        ledger_dtypes = {
+            'entity': 'category',
+            'account_category': 'category',
+            'amount': 'float64',
+            'currency': 'category'
+        }
+        read_options = {'parse_dates': ['month'], 'date_format': '%Y-%m'}
+        
+        actuals = pd.read_csv(fixtures_path / "actuals.csv", dtype=ledger_dtypes, **read_options)
+        budget = pd.read_csv(fixtures_path / "budget.csv", dtype=ledger_dtypes, **read_options)
+        fx = pd.read_csv(fixtures_path / "fx.csv",
+                         dtype={'currency': 'category', 'rate_to_usd': 'float64'}, **read_options)
+        cash = pd.read_csv(fixtures_path / "cash.csv",
+                           dtype={'entity': 'category', 'cash_usd': 'float64'}, **read_options)
         
         return actuals, budget, fx, cash
     except Exception as e:
@@ -86,6 +89,22 @@ def initialize_session_state():
             st.session_state.planner = CFOPlanner(tools)
             st.session_state.tools = tools
 
+@st.cache_data
+def compute_key_metrics(_tools, data_version: int, latest_month: str):
+    """Compute sidebar metrics, cached per data version so reruns skip the aggregations"""
+    # Revenue
+    revenue_actual = _tools.get_revenue_vs_budget(latest_month, latest_month)
+    revenue_val = revenue_actual['actual_usd'].iat[0] if not revenue_actual.empty else 0
+    
+    # Gross Margin
+    margin_data = _tools.get_gross_margin_trend(latest_month, latest_month)
+    margin_val = margin_data['gross_margin_pct'].iat[0] if not margin_data.empty else 0
+    
+    # Cash Runway
+    runway = _tools.get_cash_runway()
+    
+    return revenue_val, margin_val, runway
+
 def display_key_metrics():
     """Display key financial metrics in the sidebar"""
     if "tools" in st.session_state:
@@ -93,21 +112,14 @@ def display_key_metrics():
         
         # Get latest month data from available months
         try:
-            latest_month = max(tools.month_columns)
+            latest_month = st.session_state.planner._get_latest_month()
         except:
             latest_month = "2025-06"
         
         try:
-            # Revenue
-            revenue_actual = tools.get_revenue_vs_budget(latest_month, latest_month)
-            revenue_val = revenue_actual['actual_usd'].iloc[0] if not revenue_actual.empty else 0
-            
-            # Gross Margin
-            margin_data = tools.get_gross_margin_trend(latest_month, latest_month)
-            margin_val = margin_data['gross_margin_pct'].iloc[0] if not margin_data.empty else 0
-            
-            # Cash Runway
-            runway = tools.get_cash_runway()
+            revenue_val, margin_val, runway = compute_key_metrics(
+                tools, tools.data_version, latest_month
+            )
             
             month_display = datetime.strptime(latest_month, '%Y-%m').strftime('%B %Y')
             st.sidebar.markdown(f"### Key Metrics ({month_display})")
@@ -151,11 +163,16 @@ def handle_query(query: str):
     
     with st.spinner("Analyzing your query..."):
         try:
-            # Get response from planner
-            response = st.session_state.planner.process_query(query)
+            # Get response text and any chart data from planner
+            result = st.session_state.planner.run_query(query)
             
             # Add assistant response to messages
-            st.session_state.messages.append({"role": "assistant", "content": response})
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": result.text,
+                "chart": result.chart_df,
+                "chart_kind": result.chart_kind
+            })
             
         except Exception as e:
             error_msg = f"Sorry, I encountered an error: {str(e)}"
@@ -173,29 +190,30 @@ def display_conversation():
                 with st.container():
                     st.markdown('<div class="response-container">', unsafe_allow_html=True)
                     
-                    # Parse response for charts
-                    content = message["content"]
-                    if "CHART_DATA:" in content:
-                        parts = content.split("CHART_DATA:")
-                        text_part = parts[0]
-                        chart_json = parts[1] if len(parts) > 1 else ""
+                    st.markdown(f"**CFO Copilot:** {message['content']}")
+                    
+                    # Render chart data attached by the planner
+                    chart_data = message.get("chart")
+                    if chart_data is not None:
                         try:
-                            chart_data = pd.DataFrame(json.loads(chart_json))
                             # Example: line chart of revenue
-                            if "revenue_usd" in chart_data.columns:
+                            if message.get("chart_kind") == "line" and "revenue_usd" in chart_data.columns:
                                 fig = px.line(chart_data, x="month", y="revenue_usd",
                                               title="Revenue Trend", markers=True)
                                 fig.update_layout(yaxis_title="Revenue (USD)")
                                 st.plotly_chart(fig, use_container_width=True)
                         except Exception as e:
                             st.error(f"Error rendering chart: {e}")
-                    else:
-                        st.markdown(f"**CFO Copilot:** {content}")
         
                     st.markdown('</div>', unsafe_allow_html=True)
 
+def inject_custom_css():
+    """Inject the page's custom CSS"""
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
 def main():
     """Main application function"""
+    inject_custom_css()
     initialize_session_state()
     
     # Sidebar
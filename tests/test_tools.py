@@ -1,12 +1,13 @@
 import pytest
 import pandas as pd
+from datetime import datetime
 import sys
 from pathlib import Path
 
 # Add the agent directory to the Python path
 sys.path.append(str(Path(__file__).parent.parent / "agent"))
 
-from agent.tools import FinancialTools
+from agent.tools import FinancialTools, _normalize_months
 
 @pytest.fixture
 def sample_data():
@@ -114,6 +115,15 @@ def test_current_cash_balance(financial_tools):
         #assert isinstance(balance, (int, float))
         # Should be the latest month (2025-03 = 4.6M)
 
+def test_cash_snapshot_matches_individual_metrics(financial_tools):
+    """Test that the fused cash snapshot agrees with the single-metric tools"""
+    runway, balance, burn = financial_tools.get_cash_snapshot()
+    
+    assert balance == financial_tools.get_current_cash_balance() == 4600000
+    assert burn == pytest.approx(financial_tools.get_average_burn_rate())
+    assert runway == pytest.approx(financial_tools.get_cash_runway())
+    assert runway == pytest.approx(4600000 / 200000)
+
 def test_currency_conversion(financial_tools):
     """Test currency conversion functionality"""
     # Create a small DataFrame to test conversion
@@ -146,6 +156,36 @@ def test_ebitda_calculation(financial_tools):
         expected_ebitda = ebitda_data['revenue'] - ebitda_data['cogs'] - ebitda_data['opex']
         assert abs(ebitda_data['ebitda'] - expected_ebitda) < 0.01
 
+def test_currency_conversion_unusable_rates(financial_tools):
+    """Test that blank or zero FX rates fall back to 1.0 like missing ones"""
+    financial_tools.fx = pd.DataFrame({
+        'month': ['2025-01', '2025-02'],
+        'currency': ['EUR', 'EUR'],
+        'rate_to_usd': [float('nan'), 0.0]
+    })
+    test_df = pd.DataFrame({
+        'month': ['2025-01', '2025-02', '2025-03'],
+        'currency': ['EUR', 'EUR', 'EUR'],
+        'amount': [1000, 2000, 3000]
+    })
+    
+    converted = financial_tools._convert_to_usd(test_df)
+    
+    assert converted['amount_usd'].tolist() == [1000, 2000, 3000]
+
+def test_normalize_months_non_string_inputs():
+    """Test month normalization for Timestamp, mixed and tz-aware columns"""
+    timestamps = pd.Series([pd.Timestamp('2025-01-05'), pd.Timestamp('2025-02-01'), None], dtype=object)
+    assert _normalize_months(timestamps).tolist()[:2] == ['2025-01', '2025-02']
+    assert pd.isna(_normalize_months(timestamps).iloc[2])
+    
+    mixed = pd.Series(['2025-01', datetime(2025, 2, 1), '2025-03'], dtype=object)
+    assert _normalize_months(mixed).tolist() == ['2025-01', '2025-02', '2025-03']
+    
+    # Late on Jan 31 in New York is already February in UTC; keep local time
+    eastern = pd.Series(pd.to_datetime(['2025-01-31 23:00']).tz_localize('US/Eastern'))
+    assert _normalize_months(eastern).tolist() == ['2025-01']
+
 def test_opex_breakdown(financial_tools):
     """Test OpEx breakdown with real Opex data"""
     # Add some Opex data to test
@@ -169,6 +209,53 @@ def test_opex_breakdown(financial_tools):
     # Should have 3 categories
     assert len(result) == 3
 
+def test_reassigning_source_data_refreshes_views(financial_tools):
+    """Test that replacing a source frame rebuilds the precomputed views"""
+    version = financial_tools.data_version
+    extra_revenue = pd.DataFrame({
+        'month': ['2025-03'],
+        'entity': ['ParentCo'],
+        'account_category': ['Revenue'],
+        'amount': [1200000],
+        'currency': ['USD']
+    })
+    
+    financial_tools.actuals = pd.concat([financial_tools.actuals, extra_revenue], ignore_index=True)
+    
+    assert financial_tools.data_version != version
+    assert '2025-03' in financial_tools.month_columns
+    result = financial_tools.get_revenue_trend('2025-03', '2025-03')
+    assert result['revenue_usd'].tolist() == [1200000]
+
+def test_reassigning_source_data_normalizes_like_init(financial_tools):
+    """Test that reassigned frames get the same month and dtype handling as __init__"""
+    extra_revenue = pd.DataFrame({
+        'month': pd.to_datetime(['2025-03-01', None]),
+        'entity': ['ParentCo', 'ParentCo'],
+        'account_category': ['Revenue', 'Revenue'],
+        'amount': [1200000, 999],
+        'currency': ['USD', 'USD']
+    })
+    
+    financial_tools.actuals = pd.concat([financial_tools.actuals, extra_revenue], ignore_index=True)
+    
+    assert financial_tools.month_columns == ('2025-01', '2025-02', '2025-03')
+    assert isinstance(financial_tools.actuals['account_category'].dtype, pd.CategoricalDtype)
+    result = financial_tools.get_revenue_trend('2025-03', '2025-03')
+    assert result['revenue_usd'].tolist() == [1200000]
+
+def test_failed_reassignment_leaves_data_unchanged(financial_tools):
+    """Test that a frame that fails preprocessing is rolled back"""
+    version = financial_tools.data_version
+    actuals = financial_tools.actuals
+    
+    with pytest.raises(KeyError):
+        financial_tools.actuals = pd.DataFrame({'month': ['2025-03'], 'amount': [1.0]})
+    
+    assert financial_tools.actuals is actuals
+    assert financial_tools.data_version == version
+    assert len(financial_tools.get_revenue_trend('2025-01', '2025-02')) == 2
+
 def test_revenue_trend(financial_tools):
     """Test revenue trend over multiple months"""
     result = financial_tools.get_revenue_trend('2025-01', '2025-02')